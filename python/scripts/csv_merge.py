@@ -1,8 +1,42 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
+import hashlib
+import os
+import shutil
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import repeat
 from pathlib import Path
+from typing import TextIO
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+_WRITE_BUFFER_SIZE = 1 << 20
+
+
+def _row_fingerprint(row: list[str]) -> int:
+    """Return a 128-bit fingerprint of the row's fields, in column order."""
+    data = "\x1f".join(row)
+    if data.count("\x1f") == len(row) - 1:
+        domain = 0
+    else:
+        # A field holds the separator, so the join could match another row's;
+        # repr() is unambiguous and hashing it with a distinct seed keeps it
+        # apart from every plain join.
+        data = repr(tuple(row))
+        domain = 1
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data.encode(), seed=domain)
+    digest = hashlib.blake2b(data.encode(), digest_size=16, salt=bytes((domain,)))
+    return int.from_bytes(digest.digest(), "big")
 
 
 def merge_csv_files(
@@ -41,6 +75,98 @@ def merge_csv_files(
     return stats
 
 
+async def merge_csv_files_async(
+    input_files: list[Path],
+    output_file: Path,
+    merge_mode: str = "rows",
+    add_source: bool = False,
+    deduplicate: bool = False,
+    encoding: str = "utf-8",
+) -> dict:
+    """Run merge_csv_files on the loop's executor so many merges can overlap."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None,
+        partial(
+            merge_csv_files,
+            input_files,
+            output_file,
+            merge_mode,
+            add_source,
+            deduplicate,
+            encoding,
+        ),
+    )
+
+
+def _read_csv(input_file: Path, encoding: str) -> tuple[list[str], list[list[str]]]:
+    with input_file.open(encoding=encoding, newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        width = len(header)
+        rows = [_fit_row(row, width, input_file) for row in reader if row]
+    return header, rows
+
+
+def _fit_row(row: list[str], width: int, input_file: Path) -> list[str]:
+    if len(row) < width:
+        row.extend([""] * (width - len(row)))
+    elif len(row) > width:
+        raise ValueError(f"{input_file}: row has more fields than the header")
+    return row
+
+
+def _column_index(
+    header: list[str], fieldnames: list[str], input_file: Path
+) -> list[int] | None:
+    """Map ``fieldnames`` to positions in ``header``; None if already aligned."""
+    if header == fieldnames:
+        return None
+
+    extra = [name for name in header if name not in fieldnames]
+    if extra:
+        raise ValueError(
+            f"{input_file} has columns not in the first file: {', '.join(extra)}"
+        )
+
+    positions = {name: i for i, name in enumerate(header)}
+    return [positions.get(name, -1) for name in fieldnames]
+
+
+@contextmanager
+def _open_output(
+    output_file: Path, input_files: list[Path], encoding: str
+) -> Iterator[TextIO]:
+    """Open output_file for writing, staging it if it is also an input."""
+    if not output_file.exists() or not any(
+        os.path.samefile(f, output_file) for f in input_files
+    ):
+        with output_file.open(
+            "w", encoding=encoding, newline="", buffering=_WRITE_BUFFER_SIZE
+        ) as out:
+            yield out
+        return
+
+    # Truncating the output would destroy an input before it is read, so
+    # write beside it and swap the result in once every input is consumed.
+    target = os.path.realpath(output_file)
+    directory, name = os.path.split(target)
+    staging = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+    try:
+        with open(
+            staging, "x", encoding=encoding, newline="", buffering=_WRITE_BUFFER_SIZE
+        ) as out:
+            yield out
+        shutil.copymode(target, staging)
+        os.replace(staging, target)
+    except BaseException:
+        try:
+            os.unlink(staging)
+        except FileNotFoundError:
+            pass
+        raise
+
+
 def _merge_by_rows(
     input_files: list[Path],
     output_file: Path,
@@ -49,42 +175,47 @@ def _merge_by_rows(
     encoding: str,
     stats: dict,
 ) -> dict:
-    all_rows = []
     fieldnames: list[str] | None = None
-    seen_rows: set[tuple[tuple[str, str], ...]] = set()
-
-    for input_file in input_files:
-        with input_file.open(encoding=encoding, newline="") as f:
-            reader = csv.DictReader(f)
-            if fieldnames is None:
-                fieldnames = list(reader.fieldnames) if reader.fieldnames else []
-                if add_source:
-                    fieldnames = ["_source_file"] + fieldnames
-
-            for row in reader:
-                stats["rows_total"] += 1
-
-                if add_source:
-                    row["_source_file"] = input_file.name
-
-                if deduplicate:
-                    row_tuple = tuple(sorted(row.items()))
-                    if row_tuple in seen_rows:
-                        stats["duplicates_removed"] += 1
+    seen_rows: set[int] = set()
+
+    with _open_output(output_file, input_files, encoding) as out:
+        write_row = csv.writer(out).writerow
+
+        for input_file in input_files:
+            with input_file.open(encoding=encoding, newline="") as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                if fieldnames is None:
+                    fieldnames = header
+                    write_row(
+                        ["_source_file"] + fieldnames if add_source else fieldnames
+                    )
+                index = _column_index(header, fieldnames, input_file)
+                width = len(header)
+
+                for row in reader:
+                    if not row:
                         continue
-                    seen_rows.add(row_tuple)
+                    stats["rows_total"] += 1
 
-                all_rows.append(row)
+                    row = _fit_row(row, width, input_file)
+                    if index is not None:
+                        row = [row[i] if i >= 0 else "" for i in index]
 
-        stats["files_processed"] += 1
+                    if add_source:
+                        row.insert(0, input_file.name)
+
+                    if deduplicate:
+                        seen_count = len(seen_rows)
+                        seen_rows.add(_row_fingerprint(row))
+                        if len(seen_rows) == seen_count:
+                            stats["duplicates_removed"] += 1
+                            continue
+
+                    write_row(row)
+                    stats["rows_written"] += 1
 
-    with output_file.open("w", encoding=encoding, newline="") as f:
-        if fieldnames is None:
-            fieldnames = []
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
-        stats["rows_written"] = len(all_rows)
+            stats["files_processed"] += 1
 
     return stats
 
@@ -97,76 +228,65 @@ def _merge_by_columns(
     encoding: str,
     stats: dict,
 ) -> dict:
-    all_data: list[tuple[str, list[dict[str, str]], list[str]]] = []
+    all_data: list[tuple[str, list[list[str]], list[str]]] = []
     row_count: int | None = None
 
-    for input_file in input_files:
-        with input_file.open(encoding=encoding, newline="") as f:
-            reader = csv.DictReader(f)
-            rows = list(reader)
-
-            if row_count is None:
-                row_count = len(rows)
-            elif len(rows) != row_count:
-                raise ValueError(
-                    f"Row count mismatch: {input_file} has {len(rows)} rows, "
-                    f"expected {row_count}"
-                )
-
-            all_data.append(
-                (
-                    input_file.name,
-                    rows,
-                    list(reader.fieldnames) if reader.fieldnames else [],
-                )
+    workers = min(len(input_files), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tables = list(executor.map(_read_csv, input_files, repeat(encoding)))
+
+    for input_file, (fieldnames, rows) in zip(input_files, tables):
+        if row_count is None:
+            row_count = len(rows)
+        elif len(rows) != row_count:
+            raise ValueError(
+                f"Row count mismatch: {input_file} has {len(rows)} rows, "
+                f"expected {row_count}"
             )
 
+        all_data.append((input_file.stem, rows, fieldnames))
+
         stats["files_processed"] += 1
 
     if row_count is None:
         row_count = 0
 
-    merged_rows = []
-    seen_rows: set[tuple[tuple[str, str], ...]] = set()
-
-    for i in range(row_count):
-        merged_row: dict[str, str] = {}
-        for filename, rows, fieldnames in all_data:
-            for key, value in rows[i].items():
-                if len(all_data) > 1:
-                    new_key = f"{Path(filename).stem}.{key}"
-                else:
-                    new_key = key
-                merged_row[new_key] = value
-
-        if add_source:
-            merged_row["_merge_index"] = str(i + 1)
-
-        if deduplicate:
-            row_tuple = tuple(sorted(merged_row.items()))
-            if row_tuple in seen_rows:
-                stats["duplicates_removed"] += 1
-                continue
-            seen_rows.add(row_tuple)
-
-        merged_rows.append(merged_row)
-        stats["rows_total"] += 1
-
     all_fieldnames: list[str] = []
-    for filename, _, fieldnames in all_data:
+    for stem, _, fieldnames in all_data:
         if len(all_data) > 1:
-            all_fieldnames.extend([f"{Path(filename).stem}.{f}" for f in fieldnames])
+            all_fieldnames.extend([f"{stem}.{f}" for f in fieldnames])
         else:
             all_fieldnames.extend(fieldnames)
 
     if add_source:
         all_fieldnames.append("_merge_index")
 
-    with output_file.open("w", encoding=encoding, newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=all_fieldnames)
-        writer.writeheader()
-        writer.writerows(merged_rows)
-        stats["rows_written"] = len(merged_rows)
+    seen_rows: set[int] = set()
+
+    with output_file.open(
+        "w", encoding=encoding, newline="", buffering=_WRITE_BUFFER_SIZE
+    ) as f:
+        write_row = csv.writer(f).writerow
+        write_row(all_fieldnames)
+
+        for i in range(row_count):
+            merged_row: list[str] = []
+            for _, rows, _ in all_data:
+                merged_row.extend(rows[i])
+
+            if add_source:
+                merged_row.append(str(i + 1))
+
+            if deduplicate:
+                seen_count = len(seen_rows)
+                seen_rows.add(_row_fingerprint(merged_row))
+                if len(seen_rows) == seen_count:
+                    stats["duplicates_removed"] += 1
+                    continue
+
+            write_row(merged_row)
+            stats["rows_total"] += 1
+            stats["rows_written"] += 1
 
     return stats
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import csv
 import json
 import re
+import sys
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable
 
@@ -32,14 +35,16 @@ class ValidationResult:
     duplicates: list[dict] = field(default_factory=list)
 
 
+_EMAIL_RE = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
+_URL_RE = re.compile(r"^https?://[^\s/$.?#].[^\s]*$", re.IGNORECASE)
+
+
 def validate_email(value: str) -> bool:
-    pattern = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
-    return bool(re.match(pattern, str(value)))
+    return _EMAIL_RE.match(str(value)) is not None
 
 
 def validate_url(value: str) -> bool:
-    pattern = r"^https?://[^\s/$.?#].[^\s]*$"
-    return bool(re.match(pattern, str(value), re.IGNORECASE))
+    return _URL_RE.match(str(value)) is not None
 
 
 def validate_date(value: str, fmt: str = "%Y-%m-%d") -> bool:
@@ -52,12 +57,17 @@ def validate_date(value: str, fmt: str = "%Y-%m-%d") -> bool:
         return False
 
 
+_INT_RE = re.compile(r"-?\d+")
+_FLOAT_RE = re.compile(r"-?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_BOOL_STRINGS = frozenset(("true", "false", "1", "0"))
+
+
 TYPE_VALIDATORS: dict[str, Callable[[Any], bool]] = {
-    "int": lambda x: isinstance(x, int) or (isinstance(x, str) and x.isdigit()),
+    "int": lambda x: isinstance(x, int)
+    or (isinstance(x, str) and _INT_RE.fullmatch(x) is not None),
     "float": lambda x: isinstance(x, (int, float))
-    or (isinstance(x, str) and x.replace(".", "").isdigit()),
-    "bool": lambda x: isinstance(x, bool)
-    or str(x).lower() in ("true", "false", "1", "0"),
+    or (isinstance(x, str) and _FLOAT_RE.fullmatch(x) is not None),
+    "bool": lambda x: isinstance(x, bool) or str(x).lower() in _BOOL_STRINGS,
     "email": validate_email,
     "url": validate_url,
     "date": validate_date,
@@ -65,83 +75,155 @@ TYPE_VALIDATORS: dict[str, Callable[[Any], bool]] = {
 }
 
 
+def _compile_matchers(
+    rules: list[ValidationRule],
+) -> list[Callable[[str], re.Match | None] | None]:
+    return [re.compile(rule.pattern).match if rule.pattern else None for rule in rules]
+
+
+_VERDICT_CACHE_SIZE = 4096
+
+
+def _memoize(check: Callable[[Any], Any]) -> Callable[[str], bool]:
+    """Cache a pure per-value check so repeated column values are checked once."""
+    cache: dict[str, bool] = {}
+
+    def cached(value: str) -> bool:
+        verdict = cache.get(value)
+        if verdict is None:
+            verdict = bool(check(value))
+            if len(cache) < _VERDICT_CACHE_SIZE:
+                cache[value] = verdict
+        return verdict
+
+    return cached
+
+
+def _add_error(errors: list[str] | None, message: str) -> list[str]:
+    if errors is None:
+        return [message]
+    errors.append(message)
+    return errors
+
+
+def _csv_plan(
+    rules: list[ValidationRule], header: list[str], seen_values: dict[str, set]
+) -> list[tuple]:
+    """Resolve everything about each rule that does not depend on the row."""
+    # Later duplicates win, as with DictReader; absent fields never index a row.
+    columns = {name: i for i, name in enumerate(header)}
+    plan = []
+    for rule, matcher in zip(rules, _compile_matchers(rules)):
+        type_check = TYPE_VALIDATORS.get(rule.type_) if rule.type_ else None
+        bounded = rule.type_ in ("int", "float") and (
+            rule.min_value is not None or rule.max_value is not None
+        )
+        plan.append(
+            (
+                columns.get(rule.field, sys.maxsize),
+                rule.field,
+                rule.required,
+                rule.type_,
+                _memoize(type_check) if type_check else None,
+                _memoize(matcher) if matcher else None,
+                bounded,
+                rule.min_value,
+                rule.max_value,
+                seen_values.setdefault(rule.field, set()) if rule.unique else None,
+                rule.custom,
+                rule.error_message or f"Field '{rule.field}' failed custom validation",
+            )
+        )
+    return plan
+
+
 def validate_csv(
     file_path: Path,
     rules: list[ValidationRule],
     encoding: str = "utf-8",
     skip_header: bool = False,
+    fail_fast: bool = False,
 ) -> ValidationResult:
     result = ValidationResult(valid=True)
     seen_values: dict[str, set] = {}
 
     with file_path.open(encoding=encoding, newline="") as f:
-        reader = csv.DictReader(f)
+        reader = csv.reader(f)
+        plan = _csv_plan(rules, next(reader, []), seen_values)
 
-        for row_num, row in enumerate(reader, start=2 if skip_header else 1):
+        # filter(None, ...) drops blank lines, as DictReader does.
+        rows = filter(None, reader)
+        for row_num, row in enumerate(rows, start=2 if skip_header else 1):
             result.total_rows += 1
-            row_valid = True
-            row_errors = []
-
-            for rule in rules:
-                value = row.get(rule.field)
-
-                if rule.required and (value is None or str(value).strip() == ""):
-                    row_valid = False
-                    row_errors.append(f"Field '{rule.field}' is required")
-                    continue
-
-                if value is None or str(value).strip() == "":
+            row_errors: list[str] | None = None
+            width = len(row)
+
+            for (
+                index,
+                field_name,
+                required,
+                type_name,
+                type_check,
+                matcher,
+                bounded,
+                min_value,
+                max_value,
+                seen,
+                custom,
+                custom_message,
+            ) in plan:
+                if fail_fast and row_errors is not None:
+                    break
+
+                value = row[index] if index < width else None
+
+                if value is None or not value.strip():
+                    if required:
+                        row_errors = _add_error(
+                            row_errors, f"Field '{field_name}' is required"
+                        )
                     continue
 
-                if rule.type_ and rule.type_ in TYPE_VALIDATORS:
-                    if not TYPE_VALIDATORS[rule.type_](value):
-                        row_valid = False
-                        type_name = rule.type_
-                        row_errors.append(
-                            f"Field '{rule.field}' must be a valid {type_name}"
+                if type_check is not None:
+                    if not type_check(value):
+                        row_errors = _add_error(
+                            row_errors,
+                            f"Field '{field_name}' must be a valid {type_name}",
                         )
 
-                if rule.pattern:
-                    if not re.match(rule.pattern, str(value)):
-                        row_valid = False
-                        row_errors.append(
-                            f"Field '{rule.field}' does not match pattern"
+                if matcher is not None:
+                    if not matcher(value):
+                        row_errors = _add_error(
+                            row_errors, f"Field '{field_name}' does not match pattern"
                         )
 
-                if rule.type_ in ("int", "float"):
+                if bounded:
                     try:
                         num_value = float(value)
-                        if rule.min_value is not None and num_value < rule.min_value:
-                            row_valid = False
-                            row_errors.append(
-                                f"Field '{rule.field}' must be >= {rule.min_value}"
+                        if min_value is not None and num_value < min_value:
+                            row_errors = _add_error(
+                                row_errors,
+                                f"Field '{field_name}' must be >= {min_value}",
                             )
-                        if rule.max_value is not None and num_value > rule.max_value:
-                            row_valid = False
-                            row_errors.append(
-                                f"Field '{rule.field}' must be <= {rule.max_value}"
+                        if max_value is not None and num_value > max_value:
+                            row_errors = _add_error(
+                                row_errors,
+                                f"Field '{field_name}' must be <= {max_value}",
                             )
                     except ValueError:
                         pass
 
-                if rule.unique:
-                    if rule.field not in seen_values:
-                        seen_values[rule.field] = set()
-                    if value in seen_values[rule.field]:
+                if seen is not None:
+                    if value in seen:
                         result.duplicates.append(
-                            {"row": row_num, "field": rule.field, "value": value}
+                            {"row": row_num, "field": field_name, "value": value}
                         )
-                    seen_values[rule.field].add(value)
+                    seen.add(value)
 
-                if rule.custom and not rule.custom(value):
-                    row_valid = False
-                    msg = (
-                        rule.error_message
-                        or f"Field '{rule.field}' failed custom validation"
-                    )
-                    row_errors.append(msg)
+                if custom and not custom(value):
+                    row_errors = _add_error(row_errors, custom_message)
 
-            if row_valid:
+            if row_errors is None:
                 result.valid_rows += 1
             else:
                 result.invalid_rows += 1
@@ -155,6 +237,7 @@ def validate_json(
     file_path: Path,
     rules: list[ValidationRule],
     encoding: str = "utf-8",
+    fail_fast: bool = False,
 ) -> ValidationResult:
     with file_path.open(encoding=encoding) as f:
         data = json.load(f)
@@ -164,35 +247,41 @@ def validate_json(
 
     result = ValidationResult(valid=True)
     seen_values: dict[str, set] = {}
+    matchers = _compile_matchers(rules)
 
     for row_num, item in enumerate(data, start=1):
         result.total_rows += 1
-        row_valid = True
-        row_errors = []
+        row_errors: list[str] | None = None
 
-        for rule in rules:
-            value = item.get(rule.field)
+        for rule, matcher in zip(rules, matchers):
+            if fail_fast and row_errors is not None:
+                break
 
-            if rule.required and (value is None or str(value).strip() == ""):
-                row_valid = False
-                row_errors.append(f"Field '{rule.field}' is required")
-                continue
+            value = item.get(rule.field)
+            if value is None:
+                sval = ""
+            else:
+                sval = value if value.__class__ is str else str(value)
 
-            if value is None or str(value).strip() == "":
+            if not sval.strip():
+                if rule.required:
+                    row_errors = _add_error(
+                        row_errors, f"Field '{rule.field}' is required"
+                    )
                 continue
 
             if rule.type_ and rule.type_ in TYPE_VALIDATORS:
                 if not TYPE_VALIDATORS[rule.type_](value):
-                    row_valid = False
                     type_name = rule.type_
-                    row_errors.append(
-                        f"Field '{rule.field}' must be a valid {type_name}"
+                    row_errors = _add_error(
+                        row_errors, f"Field '{rule.field}' must be a valid {type_name}"
                     )
 
-            if rule.pattern:
-                if not re.match(rule.pattern, str(value)):
-                    row_valid = False
-                    row_errors.append(f"Field '{rule.field}' does not match pattern")
+            if matcher is not None:
+                if not matcher(sval):
+                    row_errors = _add_error(
+                        row_errors, f"Field '{rule.field}' does not match pattern"
+                    )
 
             if rule.unique:
                 if rule.field not in seen_values:
@@ -203,7 +292,7 @@ def validate_json(
                     )
                 seen_values[rule.field].add(value)
 
-        if row_valid:
+        if row_errors is None:
             result.valid_rows += 1
         else:
             result.invalid_rows += 1
@@ -213,6 +302,19 @@ def validate_json(
     return result
 
 
+async def validate_json_async(
+    file_path: Path,
+    rules: list[ValidationRule],
+    encoding: str = "utf-8",
+    fail_fast: bool = False,
+) -> ValidationResult:
+    """Run validate_json on the loop's executor so many files can overlap."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, partial(validate_json, file_path, rules, encoding, fail_fast)
+    )
+
+
 def parse_rules(rules_str: list[str]) -> list[ValidationRule]:
     rules = []
     for rule_str in rules_str:
@@ -258,6 +360,11 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--encoding", default="utf-8", help="File encoding")
     parser.add_argument("--output", type=Path, help="Output error report to file")
     parser.add_argument("--strict", action="store_true", help="Fail on any error")
+    parser.add_argument(
+        "--fail-fast-row",
+        action="store_true",
+        help="Stop checking a row's remaining rules after its first error",
+    )
 
     args = parser.parse_args(argv)
 
@@ -274,9 +381,13 @@ def main(argv: list[str] | None = None) -> int:
         rules = parse_rules(args.rule)
 
         if file_format == "csv":
-            result = validate_csv(args.file, rules, args.encoding)
+            result = validate_csv(
+                args.file, rules, args.encoding, fail_fast=args.fail_fast_row
+            )
         else:
-            result = validate_json(args.file, rules, args.encoding)
+            result = validate_json(
+                args.file, rules, args.encoding, fail_fast=args.fail_fast_row
+            )
 
         print(f"Total rows: {result.total_rows}")
         print(f"Valid rows: {result.valid_rows}")
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import argparse
 import re
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -17,13 +18,17 @@ DEFAULT_SENSITIVE_PATTERNS = [
 ]
 
 
+@lru_cache(maxsize=32)
+def _compile_patterns(patterns: tuple[str, ...]) -> re.Pattern:
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+_SENSITIVE_RE = _compile_patterns(tuple(DEFAULT_SENSITIVE_PATTERNS))
+
+
 def is_sensitive_key(key: str, patterns: list[str] | None = None) -> bool:
-    patterns = patterns or DEFAULT_SENSITIVE_PATTERNS
-    key_lower = key.lower()
-    for pattern in patterns:
-        if re.match(pattern, key_lower, re.IGNORECASE):
-            return True
-    return False
+    regex = _compile_patterns(tuple(patterns)) if patterns else _SENSITIVE_RE
+    return regex.match(key.lower()) is not None
 
 
 def generate_template(
@@ -37,28 +42,29 @@ def generate_template(
         raise FileNotFoundError(f"Environment file not found: {env_path}")
 
     lines = []
-    with env_path.open(encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n\r")
-            stripped = line.strip()
-
-            if not stripped or stripped.startswith("#"):
-                lines.append(line)
-                continue
-
-            if "=" in stripped:
-                key, _, value = stripped.partition("=")
-                key = key.strip()
-                value = value.strip().strip("'\"")
-
-                if keep_values:
-                    lines.append(f"{key}={value}")
-                elif is_sensitive_key(key, patterns):
-                    lines.append(f"{key}={placeholder}")
-                else:
-                    lines.append(f"{key}={value}")
+    # One read for the whole file; bytes.splitlines() splits on the same
+    # \n, \r\n and \r boundaries as text-mode universal newlines.
+    for raw_line in env_path.read_bytes().splitlines():
+        line = raw_line.decode("utf-8")
+        stripped = line.strip()
+
+        if not stripped or stripped.startswith("#"):
+            lines.append(line)
+            continue
+
+        if "=" in stripped:
+            key, _, value = stripped.partition("=")
+            key = key.strip()
+            value = value.strip().strip("'\"")
+
+            if keep_values:
+                lines.append(f"{key}={value}")
+            elif is_sensitive_key(key, patterns):
+                lines.append(f"{key}={placeholder}")
             else:
-                lines.append(line)
+                lines.append(f"{key}={value}")
+        else:
+            lines.append(line)
 
     template_content = "\n".join(lines) + "\n"
 
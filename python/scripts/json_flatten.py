@@ -2,8 +2,21 @@ from __future__ import annotations
 
 import argparse
 import json
+import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files with a 19+ digit number are read with json: orjson would turn integers
+# past 64 bits into floats and the flattened values would lose precision.
+_WIDE_INT_RE = re.compile(rb"\d{19}")
+# orjson spells NaN and Infinity as null, 1e+16 as 1e16 and 5e-05 as 0.00005,
+# so output with any of these marks is checked before it is used.
+_FLOAT_MARK_RE = re.compile(rb"null|\de|0\.0000")
 
 
 def flatten(
@@ -14,32 +27,39 @@ def flatten(
     current_depth: int = 0,
 ) -> dict[str, Any]:
     result: dict[str, Any] = {}
-
-    for key, value in data.items():
-        new_key = f"{prefix}{separator}{key}" if prefix else key
-
-        if max_depth is not None and current_depth >= max_depth:
-            result[new_key] = value
-        elif isinstance(value, dict):
-            nested = flatten(value, separator, new_key, max_depth, current_depth + 1)
-            result.update(nested)
-        elif isinstance(value, list):
-            for i, item in enumerate(value):
-                list_key = f"{new_key}{separator}{i}"
-                if isinstance(item, dict):
-                    nested = flatten(
-                        item, separator, list_key, max_depth, current_depth + 1
-                    )
-                    result.update(nested)
-                elif isinstance(item, list):
-                    nested = flatten(
-                        {str(i): item}, separator, new_key, max_depth, current_depth + 1
-                    )
-                    result.update(nested)
-                else:
-                    result[list_key] = item
+    # Each frame is (key prefix, pending (key, value) pairs, depth, from a list).
+    stack: list[tuple[Any, Iterator[tuple[Any, Any]], int, bool]] = [
+        (prefix, iter(data.items()), current_depth, False)
+    ]
+
+    while stack:
+        base, items, depth, in_list = stack[-1]
+        for key, value in items:
+            if in_list:
+                # List indices always follow a separator, even under a "" key.
+                new_key = f"{base}{separator}{key}"
+                if isinstance(value, dict):
+                    stack.append((new_key, iter(value.items()), depth, False))
+                    break
+                if isinstance(value, list):
+                    stack.append((base, iter(((str(key), value),)), depth, False))
+                    break
+                result[new_key] = value
+                continue
+
+            new_key = f"{base}{separator}{key}" if base else key
+            if max_depth is not None and depth >= max_depth:
+                result[new_key] = value
+            elif isinstance(value, dict):
+                stack.append((new_key, iter(value.items()), depth + 1, False))
+                break
+            elif isinstance(value, list):
+                stack.append((new_key, enumerate(value), depth + 1, True))
+                break
+            else:
+                result[new_key] = value
         else:
-            result[new_key] = value
+            stack.pop()
 
     return result
 
@@ -87,6 +107,46 @@ def unflatten(data: dict[str, Any], separator: str = ".") -> dict[str, Any] | li
     return result
 
 
+def _load_json(path: Path) -> Any:
+    raw = path.read_bytes()
+    if orjson is not None and not _WIDE_INT_RE.search(raw):
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass  # NaN or Infinity, say; json.loads accepts those
+    return json.loads(raw)
+
+
+def _has_respelled_float(data: Any) -> bool:
+    """Whether data holds a float orjson would not spell the way json does."""
+    # Kept in step with yaml_json._has_respelled_float.
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        # repr() switches to exponent form outside [1e-4, 1e16); NaN and the
+        # infinities fail both tests.
+        elif kind is float and not (value == 0 or 1e-4 <= abs(value) < 1e16):
+            return True
+    return False
+
+
+def _dump_json(data: Any) -> bytes:
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            if not (_FLOAT_MARK_RE.search(payload) and _has_respelled_float(data)):
+                return payload
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def process_file(
     input_path: Path,
     output_path: Path | None,
@@ -94,8 +154,7 @@ def process_file(
     separator: str = ".",
     max_depth: int | None = None,
 ) -> str:
-    with input_path.open(encoding="utf-8") as f:
-        data = json.load(f)
+    data = _load_json(input_path)
 
     if mode == "flatten":
         if not isinstance(data, dict):
@@ -108,12 +167,12 @@ def process_file(
     else:
         raise ValueError(f"Unknown mode: {mode}")
 
-    output = json.dumps(result, ensure_ascii=False, indent=2)
+    payload = _dump_json(result)
 
     if output_path:
-        output_path.write_text(output, encoding="utf-8")
+        output_path.write_bytes(payload)
 
-    return output
+    return payload.decode("utf-8")
 
 
 def main(argv: list[str] | None = None) -> int:
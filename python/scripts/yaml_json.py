@@ -1,36 +1,563 @@
 from __future__ import annotations
 
-import argparse
 import json
+import math
+import mmap
+import os
+import re
+import shutil
+import stat
+import sys
+import warnings
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache, partial
+from itertools import chain, islice, repeat
 from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, BinaryIO
 
+if TYPE_CHECKING:
+    import argparse
 
-def convert_yaml_to_json(yaml_path: Path, json_path: Path, indent: int = 2) -> None:
+try:
+    import yaml
+except ImportError as exc:
+    yaml = None
+    _YAML_IMPORT_ERROR = exc
+else:
+    _YAML_IMPORT_ERROR = None
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    _YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    if not getattr(yaml, "__with_libyaml__", False):
+        warnings.warn(
+            f"PyYAML {yaml.__version__} loaded without libyaml; using "
+            f"{_YAML_LOADER.__name__}, so YAML conversions will be ~10x slower. "
+            "Install libyaml-dev and reinstall pyyaml.",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+else:
+    # orjson decodes integers outside the 64-bit range as floats; JSON input
+    # with a digit run this long is parsed by the json module instead.
+    _WIDE_INT_RE = re.compile(rb"\d{19}")
+    _ORJSON_FLOAT_MARK_RE = re.compile(rb"null|\de|0\.0000")
+    # Datetime values pass through so they fail like the stdlib encoder does.
+    # Non-str mapping keys make orjson raise too, leaving those documents to
+    # json, which stringifies int/float/bool/null keys and rejects the rest.
+    _ORJSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATETIME
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# JSON arrays at least this large are streamed to YAML one element at a time
+# when ijson is installed, instead of being loaded whole.
+_STREAM_JSON_MIN_BYTES = 64 << 20
+_STREAM_BUFFER_SIZE = 1 << 20
+
+# Inputs at least this large are parsed from a read-only mapping rather than
+# a bytes copy of the whole file.
+_MMAP_MIN_BYTES = 64 << 10
+
+_NO_DOCUMENT = object()
+
+# Temporary outputs are created exclusively, so the kernel applies the live
+# umask to them just as it would for open(path, "wb").
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+# Strings _fast_dump may emit unquoted: they start with a letter or "_", hold
+# no YAML indicator characters, and cannot resolve to a bool or null.
+_PLAIN_STR_RE = re.compile(r"[^\W\d][\w\-. ]*")
+# libyaml double-quotes any string with a character outside the BMP.
+_NON_BMP_RE = re.compile("[\U00010000-\U0010ffff]")
+_RESERVED_WORDS = frozenset(("yes", "no", "true", "false", "on", "off", "null"))
+# libyaml folds plain scalars at a space past this column.
+_YAML_WIDTH = 80
+
+_YAML_EXTS = frozenset((".yaml", ".yml"))
+_JSON_EXTS = frozenset((".json",))
+
+# Smaller batches stay serial; they would not pay back the pool start-up cost.
+_PARALLEL_MIN_FILES = 8
+# Files handed to a pool worker per round trip; results come back per chunk.
+_POOL_CHUNK_SIZE = 4
+_WORKERS_ENV = "YAML_JSON_WORKERS"
+
+
+def _has_respelled_float(data: object) -> bool:
+    """Whether data holds a float orjson would not spell the way json does."""
+    # Kept in step with json_flatten._has_respelled_float.
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind is dict:
+            stack.extend(value.values())
+        elif kind is list:
+            stack.extend(value)
+        # repr() switches to exponent form outside [1e-4, 1e16); NaN and the
+        # infinities fail both tests.
+        elif kind is float and not (value == 0 or 1e-4 <= abs(value) < 1e16):
+            return True
+    return False
+
+
+def _orjson_dumps(data: object, indent: int) -> bytes | None:
+    """Encode with orjson when its output matches json.dumps(indent=indent)."""
+    if orjson is None or indent != 2:
+        return None
     try:
-        import yaml
-    except ImportError:
-        raise ImportError("PyYAML is required. Install with: pip install pyyaml")
+        payload = orjson.dumps(data, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None
+    # orjson writes NaN and Infinity as null, exponents as 1e16 rather than
+    # 1e+16, and values in [1e-5, 1e-4) as 0.0000x rather than x..e-05. Each
+    # leaves one of these marks, and only then is a walk needed.
+    if _ORJSON_FLOAT_MARK_RE.search(payload) and _has_respelled_float(data):
+        return None
+    return payload
+
 
-    with yaml_path.open(encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+@lru_cache(maxsize=8)
+def _json_encoder(indent: int) -> Callable[[object], str]:
+    """Return a reusable encode function; json.dumps builds one per call."""
+    # YAML documents are trees unless they use recursive aliases, which now
+    # fail with RecursionError instead of the circular-reference ValueError.
+    return json.JSONEncoder(
+        ensure_ascii=False, indent=indent, check_circular=False
+    ).encode
 
-    with json_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=indent)
 
+def _read_bytes(path: str | Path) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
 
-def convert_json_to_yaml(json_path: Path, yaml_path: Path) -> None:
+
+@contextmanager
+def _atomic_output(path: str | Path, buffering: int = -1) -> Iterator[BinaryIO]:
+    """Write to a temporary sibling of path, moving it into place on success."""
+    # Write through a symlink rather than replacing it with a regular file.
+    target = os.path.realpath(path)
+    try:
+        mode = stat.S_IMODE(os.stat(target).st_mode)
+    except FileNotFoundError:
+        mode = None
+    directory, name = os.path.split(target)
+    # A random name keeps concurrent writers of the same output apart.
+    while True:
+        tmp_path = os.path.join(directory, f".{name}.{os.urandom(6).hex()}.tmp")
+        try:
+            fd = os.open(tmp_path, _TMP_FLAGS, 0o666)
+        except FileExistsError:
+            continue
+        break
     try:
-        import yaml
-    except ImportError:
-        raise ImportError("PyYAML is required. Install with: pip install pyyaml")
+        with open(fd, "wb", buffering=buffering) as f:
+            if mode is not None:
+                # Keep an existing output's permissions, as open(path, "wb") does.
+                os.fchmod(fd, mode)
+            yield f
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
 
-    with json_path.open(encoding="utf-8") as f:
-        data = json.load(f)
 
-    with yaml_path.open("w", encoding="utf-8") as f:
-        yaml.dump(
-            data, f, default_flow_style=False, allow_unicode=True, sort_keys=False
-        )
+@contextmanager
+def _input_buffer(path: str | Path) -> Iterator[bytes | mmap.mmap]:
+    """Yield the contents of path, memory-mapped when the file is large."""
+    # Empty files cannot be mapped; they always fall under the threshold.
+    if os.stat(path).st_size < _MMAP_MIN_BYTES:
+        yield _read_bytes(path)
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        yield mm
+
+
+def _write_bytes(path: str | Path, payload: bytes) -> None:
+    with _atomic_output(path) as f:
+        f.write(payload)
+
+
+def convert_yaml_to_json(
+    yaml_path: str | Path, json_path: str | Path, indent: int = 2
+) -> None:
+    if yaml is None:
+        raise ImportError(
+            "PyYAML is required. Install with: pip install pyyaml"
+        ) from _YAML_IMPORT_ERROR
+
+    # libyaml decodes the raw bytes itself, honouring any BOM.
+    with _input_buffer(yaml_path) as raw:
+        documents = yaml.load_all(raw, Loader=_YAML_LOADER)
+        _write_json_documents(documents, json_path, indent)
+
+
+def _encode_json(data: object, indent: int) -> bytes:
+    payload = _orjson_dumps(data, indent)
+    if payload is None:
+        payload = _json_encoder(indent)(data).encode("utf-8")
+    return payload
+
+
+def _write_json_documents(
+    documents: Iterator[object], json_path: str | Path, indent: int
+) -> None:
+    """Write a single YAML document as JSON, or several as a JSON array."""
+    first = next(documents, None)
+    second = next(documents, _NO_DOCUMENT)
+    if second is _NO_DOCUMENT:
+        _write_bytes(json_path, _encode_json(first, indent))
+        return
+
+    # Each document is encoded on its own and indented one level, which is
+    # byte-for-byte what json.dumps(list_of_documents, indent=indent) emits.
+    prefix = b" " * indent
+    with _atomic_output(json_path) as f:
+        f.write(b"[")
+        separator = b"\n"
+        for document in chain((first, second), documents):
+            payload = _encode_json(document, indent)
+            f.write(separator + prefix + payload.replace(b"\n", b"\n" + prefix))
+            separator = b",\n"
+        f.write(b"\n]")
+
+
+def convert_json_to_yaml(json_path: str | Path, yaml_path: str | Path) -> None:
+    if yaml is None:
+        raise ImportError(
+            "PyYAML is required. Install with: pip install pyyaml"
+        ) from _YAML_IMPORT_ERROR
+
+    if (
+        ijson is not None
+        and os.stat(json_path).st_size >= _STREAM_JSON_MIN_BYTES
+        and _stream_json_array_to_yaml(json_path, yaml_path)
+    ):
+        return
+
+    with _input_buffer(json_path) as raw:
+        data = _load_json(raw)
+    _write_bytes(yaml_path, _fast_dump(data))
+
+
+def _load_json(raw: bytes | mmap.mmap) -> object:
+    if orjson is not None and not _WIDE_INT_RE.search(raw):
+        try:
+            # A memoryview lets orjson read a mapping in place.
+            with memoryview(raw) as view:
+                return orjson.loads(view)
+        except orjson.JSONDecodeError:
+            pass  # orjson rejects NaN and Infinity, which json accepts
+    return json.loads(raw if isinstance(raw, bytes) else raw[:])
+
+
+def _dump_yaml(data: object) -> bytes:
+    # With an encoding and no stream, yaml.dump returns the encoded bytes.
+    return yaml.dump(
+        data,
+        Dumper=_YAML_DUMPER,
+        default_flow_style=False,
+        allow_unicode=True,
+        sort_keys=False,
+        encoding="utf-8",
+    )
+
+
+class _NotFastDumpable(Exception):
+    pass
+
+
+def _fast_scalar(value: object, column: int) -> str:
+    """Render value as yaml.dump would, or raise _NotFastDumpable."""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    value_type = type(value)
+    if value_type is int:
+        return str(value)
+    if value_type is float and math.isfinite(value):
+        # SafeRepresenter.represent_float, minus the non-finite cases.
+        text = repr(value).lower()
+        if "." not in text and "e" in text:
+            text = text.replace("e", ".0e", 1)
+        return text
+    if (
+        value_type is str
+        and column + len(value) <= _YAML_WIDTH
+        and _PLAIN_STR_RE.fullmatch(value)
+        and (value.isascii() or _NON_BMP_RE.search(value) is None)
+        and not value.endswith(" ")
+        and value.lower() not in _RESERVED_WORDS
+    ):
+        return value
+    raise _NotFastDumpable
+
+
+def _fast_mapping(data: dict, indent: int, head: str, lines: list[str]) -> None:
+    for key, value in data.items():
+        if type(key) is not str:
+            raise _NotFastDumpable
+        line = f"{head}{_fast_scalar(key, indent)}:"
+        head = " " * indent
+        if type(value) is dict and value:
+            lines.append(line)
+            _fast_mapping(value, indent + 2, head + "  ", lines)
+        elif type(value) is list and value:
+            # PyYAML does not indent a sequence nested in a mapping.
+            lines.append(line)
+            _fast_sequence(value, indent, head, lines)
+        else:
+            lines.append(f"{line} {_fast_value(value, len(line) + 1)}")
+
+
+def _fast_sequence(data: list, indent: int, head: str, lines: list[str]) -> None:
+    for value in data:
+        line = f"{head}- "
+        head = " " * indent
+        if type(value) is dict and value:
+            _fast_mapping(value, indent + 2, line, lines)
+        elif type(value) is list and value:
+            _fast_sequence(value, indent + 2, line, lines)
+        else:
+            lines.append(f"{line}{_fast_value(value, len(line))}")
+
+
+def _fast_value(value: object, column: int) -> str:
+    if type(value) is dict:
+        return "{}"
+    if type(value) is list:
+        return "[]"
+    return _fast_scalar(value, column)
+
+
+def _fast_dump(data: object) -> bytes:
+    """Emit plain JSON-shaped data directly, byte-identical to _dump_yaml."""
+    lines: list[str] = []
+    try:
+        if type(data) is dict and data:
+            _fast_mapping(data, 0, "", lines)
+        elif type(data) is list and data:
+            _fast_sequence(data, 0, "", lines)
+        else:
+            raise _NotFastDumpable
+    except (_NotFastDumpable, RecursionError):
+        return _dump_yaml(data)
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def _stream_json_array_to_yaml(json_path: str | Path, yaml_path: str | Path) -> bool:
+    """Write a top-level JSON array as YAML; False to fall back to a full load."""
+    # A block sequence dumped one item at a time concatenates to exactly what
+    # dumping the whole list produces, so the output is unchanged.
+    with open(json_path, "rb") as src:
+        head = src.read(4096).lstrip()
+        if not head.startswith(b"["):
+            return False
+        src.seek(0)
+
+        try:
+            # One small write per element, so buffer well past io's 8 KiB default.
+            with _atomic_output(yaml_path, buffering=_STREAM_BUFFER_SIZE) as dst:
+                empty = True
+                items = ijson.items(
+                    src, "item", use_float=True, buf_size=_STREAM_BUFFER_SIZE
+                )
+                for item in items:
+                    dst.write(_dump_yaml([item]))
+                    empty = False
+                if empty:
+                    dst.write(_dump_yaml([]))
+        except ijson.JSONError:
+            # yajl rejects NaN and Infinity, which a full load accepts; the
+            # partial output is already discarded, so the caller can retry.
+            return False
+    return True
+
+
+def _copy_file(input_path: str | Path, output_path: str | Path) -> None:
+    """Copy a file through _atomic_output; copying it onto itself does nothing."""
+    try:
+        if os.path.samefile(input_path, output_path):
+            return
+    except FileNotFoundError:
+        pass
+    with open(input_path, "rb") as src, _atomic_output(output_path) as dst:
+        shutil.copyfileobj(src, dst, _STREAM_BUFFER_SIZE)
+
+
+def _reindent_json(
+    input_path: str | Path, output_path: str | Path, indent: int = 2
+) -> None:
+    # Loaded in full before writing, so rewriting a file in place is safe.
+    with _input_buffer(input_path) as raw:
+        data = _load_json(raw)
+    _write_bytes(output_path, _encode_json(data, indent))
+
+
+def _output_path(input_file: str, output_dir: str, output_suffix: str) -> str:
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    return f"{output_dir}{os.sep}{stem}{output_suffix}"
+
+
+def _is_up_to_date(input_file: str, output_file: str) -> bool:
+    try:
+        return os.stat(output_file).st_mtime >= os.stat(input_file).st_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _convert_one(
+    input_file: str,
+    output_dir: str,
+    convert: Callable[[str, str], object],
+    output_suffix: str,
+    skip_unchanged: bool,
+) -> tuple[str, str | None]:
+    """Convert one batch file, returning its stats key and any error message."""
+    try:
+        output_file = _output_path(input_file, output_dir, output_suffix)
+
+        if skip_unchanged and _is_up_to_date(input_file, output_file):
+            return "skipped", None
+
+        convert(input_file, output_file)
+    except Exception as e:
+        return "failed", f"{input_file}: {e}"
+    return "processed", None
+
+
+def _tally(stats: dict, results: Iterable[tuple[str, str | None]]) -> None:
+    """Count batch results from _convert_one into stats as they arrive."""
+    for key, error in results:
+        stats[key] += 1
+        if error is not None:
+            stats["errors"].append(error)
+
+
+def _scan_inputs(input_dir: Path, suffixes: tuple[str, ...]) -> Iterator[str]:
+    """Yield paths of files in input_dir whose names end with one of suffixes."""
+    # A missing or unreadable directory yields no files, as Path.glob did.
+    try:
+        with os.scandir(input_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(suffixes) and entry.is_file():
+                    yield entry.path
+    except OSError:
+        return
+
+
+def _load_cache(cache_path: str | Path) -> dict:
+    try:
+        cache = json.loads(_read_bytes(cache_path))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _cache_entry(input_file: str, output_file: str, settings: list) -> list:
+    """Describe a conversion by file stats and the settings it was run with."""
+    st = os.stat(input_file)
+    return [
+        st.st_mtime_ns,
+        st.st_size,
+        output_file,
+        os.stat(output_file).st_mtime_ns,
+        *settings,
+    ]
+
+
+def _skip_cached(
+    files: Iterable[str],
+    output_dir: str,
+    output_suffix: str,
+    settings: list,
+    cache: dict,
+    fresh_cache: dict,
+    pending: list,
+    stats: dict,
+) -> Iterator[str]:
+    """Yield the files whose cache entry no longer matches input and output."""
+    for input_file in files:
+        key = os.path.abspath(input_file)
+        output_file = _output_path(input_file, output_dir, output_suffix)
+        try:
+            entry = _cache_entry(input_file, output_file, settings)
+        except OSError:
+            entry = None
+        if entry is not None and cache.get(key) == entry:
+            fresh_cache[key] = entry
+            stats["processed"] += 1
+            continue
+        pending.append((key, input_file, output_file))
+        yield input_file
+
+
+def _record_conversions(
+    results: Iterable[tuple[str, str | None]],
+    pending: list,
+    settings: list,
+    fresh_cache: dict,
+) -> Iterator[tuple[str, str | None]]:
+    """Pass results through, caching the stats of each converted file."""
+    # Results arrive in input order, and each input is appended to pending
+    # before its result can be produced.
+    for index, result in enumerate(results):
+        if result[0] == "processed":
+            key, input_file, output_file = pending[index]
+            try:
+                fresh_cache[key] = _cache_entry(input_file, output_file, settings)
+            except OSError:
+                pass
+        yield result
+
+
+def _load_first_yaml_document(raw: bytes) -> object:
+    return next(yaml.load_all(raw, Loader=_YAML_LOADER), None)
+
+
+def _filter_by_header(
+    files: Iterable[str],
+    header_filter: Callable[[dict], bool],
+    header_lines: int,
+    load_full: Callable[[bytes], object],
+    stats: dict,
+) -> Iterator[str]:
+    """Yield the files whose leading lines satisfy header_filter."""
+    for input_file in files:
+        try:
+            with open(input_file, "rb") as f:
+                head = b"".join(islice(f, header_lines))
+            try:
+                header = _load_first_yaml_document(head)
+            except yaml.YAMLError:
+                # The cut fell inside a flow collection or quoted scalar;
+                # judge the file on its full contents instead.
+                header = load_full(_read_bytes(input_file))
+        except (OSError, ValueError, yaml.YAMLError):
+            # Unreadable or invalid; let the conversion report the error.
+            yield input_file
+            continue
+
+        if header_filter(header if isinstance(header, dict) else {}):
+            yield input_file
+        else:
+            stats["skipped"] += 1
 
 
 def batch_convert(
@@ -39,44 +566,130 @@ def batch_convert(
     source_format: str,
     target_format: str,
     indent: int = 2,
+    workers: int | None = None,
+    skip_unchanged: bool = False,
+    header_filter: Callable[[dict], bool] | None = None,
+    header_lines: int = 20,
+    cache_path: Path | None = None,
 ) -> dict:
+    if workers is None and os.environ.get(_WORKERS_ENV):
+        workers = int(os.environ[_WORKERS_ENV])
+    if workers is not None and workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+
     if source_format == "yaml":
-        pattern = "*.yaml"
-        pattern_alt = "*.yml"
+        suffixes = tuple(_YAML_EXTS)
     elif source_format == "json":
-        pattern = "*.json"
-        pattern_alt = None
+        suffixes = tuple(_JSON_EXTS)
     else:
         raise ValueError(f"Unknown source format: {source_format}")
 
-    files = list(input_dir.glob(pattern))
-    if pattern_alt:
-        files.extend(input_dir.glob(pattern_alt))
+    if target_format == "json":
+        output_suffix = ".json"
+    elif target_format == "yaml":
+        output_suffix = ".yaml"
+    else:
+        raise ValueError(f"Unknown target format: {target_format}")
 
-    stats = {"processed": 0, "failed": 0, "errors": []}
+    if source_format == "json" and target_format == "json":
+        convert = partial(_reindent_json, indent=indent)
+    elif source_format == target_format:
+        # Nothing to convert, and re-emitting would drop comments.
+        convert = _copy_file
+    elif target_format == "json":
+        convert = partial(convert_yaml_to_json, indent=indent)
+    else:
+        convert = convert_json_to_yaml
 
-    output_dir.mkdir(parents=True, exist_ok=True)
+    stats = {"processed": 0, "skipped": 0, "failed": 0, "errors": []}
 
-    for input_file in files:
-        try:
-            if target_format == "json":
-                output_file = output_dir / f"{input_file.stem}.json"
-                convert_yaml_to_json(input_file, output_file, indent)
-            elif target_format == "yaml":
-                output_file = output_dir / f"{input_file.stem}.yaml"
-                convert_json_to_yaml(input_file, output_file)
-            else:
-                raise ValueError(f"Unknown target format: {target_format}")
+    files = _scan_inputs(input_dir, suffixes)
+    if header_filter is not None:
+        if yaml is None:
+            raise ImportError(
+                "PyYAML is required. Install with: pip install pyyaml"
+            ) from _YAML_IMPORT_ERROR
+        # Evaluated here rather than in the workers: the predicate is often a
+        # lambda, which cannot be pickled, and reading a few lines is cheap.
+        load_full = _load_json if source_format == "json" else _load_first_yaml_document
+        files = _filter_by_header(files, header_filter, header_lines, load_full, stats)
+    output_dir_str = os.fspath(output_dir)
+    if cache_path is not None:
+        # Entries are rebuilt on every run, so removed inputs drop out; a
+        # change of format or indent invalidates them.
+        settings = [source_format, target_format, indent]
+        cache = _load_cache(cache_path)
+        fresh_cache: dict = {}
+        pending: list = []
+        files = _skip_cached(
+            files,
+            output_dir_str,
+            output_suffix,
+            settings,
+            cache,
+            fresh_cache,
+            pending,
+            stats,
+        )
+    head = list(islice(files, _PARALLEL_MIN_FILES))
 
-            stats["processed"] += 1
-        except Exception as e:
-            stats["failed"] += 1
-            stats["errors"].append(f"{input_file}: {e}")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    args = (
+        repeat(output_dir_str),
+        repeat(convert),
+        repeat(output_suffix),
+        repeat(skip_unchanged),
+    )
+    # Parsing and emitting are CPU-bound per file, and libyaml holds the GIL
+    # while building objects, so this needs processes, not threads.
+    parallel = workers != 1 and len(head) >= _PARALLEL_MIN_FILES
+    with ProcessPoolExecutor(workers) if parallel else nullcontext() as executor:
+        if parallel:
+            results = executor.map(
+                _convert_one, chain(head, files), *args, chunksize=_POOL_CHUNK_SIZE
+            )
+        else:
+            results = map(_convert_one, chain(head, files), *args)
+        if cache_path is None:
+            _tally(stats, results)
+        else:
+            try:
+                _tally(
+                    stats, _record_conversions(results, pending, settings, fresh_cache)
+                )
+            finally:
+                _write_bytes(cache_path, json.dumps(fresh_cache).encode("utf-8"))
 
     return stats
 
 
-def main(argv: list[str] | None = None) -> int:
+def _convert_file(input_path: Path, output_path: Path, indent: int) -> int:
+    """Run the convert command, returning the CLI exit code."""
+    input_ext = input_path.suffix.lower()
+    output_ext = output_path.suffix.lower()
+
+    try:
+        if input_ext in _YAML_EXTS and output_ext in _JSON_EXTS:
+            convert_yaml_to_json(input_path, output_path, indent)
+        elif input_ext in _JSON_EXTS and output_ext in _YAML_EXTS:
+            convert_json_to_yaml(input_path, output_path)
+        else:
+            print(f"Error: Unsupported conversion {input_ext} -> {output_ext}")
+            return 1
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"Converted: {input_path} -> {output_path}")
+    return 0
+
+
+@lru_cache(maxsize=1)
+def _get_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser once; argparse is imported only when needed."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Convert between YAML and JSON formats"
     )
@@ -109,38 +722,113 @@ def main(argv: list[str] | None = None) -> int:
     batch_parser.add_argument(
         "--indent", type=int, default=2, help="JSON indentation (default: 2)"
     )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=f"Worker processes (default: ${_WORKERS_ENV} or CPU count)",
+    )
+    batch_parser.add_argument(
+        "--skip-unchanged",
+        action="store_true",
+        help="Skip files whose output is newer than the input",
+    )
+
+    return parser
+
+
+def _choice(value: str) -> str:
+    if value not in ("yaml", "json"):
+        raise ValueError(value)
+    return value
+
 
-    args = parser.parse_args(argv)
+# Per-command positionals, valued options, flags and defaults for _parse_fast.
+_FAST_COMMANDS = {
+    "convert": (("input", "output"), {"--indent": ("indent", int)}, {}, {"indent": 2}),
+    "batch": (
+        ("input_dir", "output_dir"),
+        {
+            "--from": ("source_format", _choice),
+            "--to": ("target_format", _choice),
+            "--indent": ("indent", int),
+            "--workers": ("workers", int),
+        },
+        {"--skip-unchanged": "skip_unchanged"},
+        {"indent": 2, "workers": None, "skip_unchanged": False},
+    ),
+}
+
+
+def _parse_fast(argv: list[str]) -> SimpleNamespace | None:
+    """Parse well-formed convert/batch argv by hand; None defers to argparse."""
+    if not argv or argv[0] not in _FAST_COMMANDS:
+        return None
+    names, options, flags, defaults = _FAST_COMMANDS[argv[0]]
+    parsed = dict(defaults, command=argv[0])
+    positionals = []
+    args = iter(argv[1:])
+    for arg in args:
+        if not arg.startswith("-"):
+            positionals.append(Path(arg))
+            continue
+        option, eq, value = arg.partition("=")
+        if option in flags and not eq:
+            parsed[flags[option]] = True
+            continue
+        if option not in options:
+            return None
+        if not eq:
+            value = next(args, None)
+            if value is None:
+                return None
+        dest, convert = options[option]
+        try:
+            parsed[dest] = convert(value)
+        except ValueError:
+            return None
+    # Options without a default (--from/--to) are required.
+    if len(positionals) != len(names) or not all(
+        dest in parsed for dest, _ in options.values()
+    ):
+        return None
+    parsed.update(zip(names, positionals))
+    return SimpleNamespace(**parsed)
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Common invocations skip building the argparse tree entirely; help,
+    # abbreviations and malformed input still go through argparse so its
+    # messages and exit codes are unchanged.
+    args = _parse_fast(argv)
+    if args is None:
+        args = _get_parser().parse_args(argv)
 
     if args.command is None:
-        parser.print_help()
+        _get_parser().print_help()
         return 1
 
+    if args.command == "convert":
+        return _convert_file(args.input, args.output, args.indent)
+
     try:
-        if args.command == "convert":
-            input_ext = args.input.suffix.lower()
-            output_ext = args.output.suffix.lower()
-
-            if input_ext in (".yaml", ".yml") and output_ext == ".json":
-                convert_yaml_to_json(args.input, args.output, args.indent)
-                print(f"Converted: {args.input} -> {args.output}")
-            elif input_ext == ".json" and output_ext in (".yaml", ".yml"):
-                convert_json_to_yaml(args.input, args.output)
-                print(f"Converted: {args.input} -> {args.output}")
-            else:
-                print(f"Error: Unsupported conversion {input_ext} -> {output_ext}")
-                return 1
-
-        elif args.command == "batch":
+        if args.command == "batch":
             stats = batch_convert(
                 args.input_dir,
                 args.output_dir,
                 args.source_format,
                 args.target_format,
                 args.indent,
+                args.workers,
+                args.skip_unchanged,
             )
 
             print(f"Files processed: {stats['processed']}")
+            if stats["skipped"]:
+                print(f"Files skipped: {stats['skipped']}")
             print(f"Files failed: {stats['failed']}")
 
             if stats["errors"]:
@@ -1,54 +1,60 @@
 import pytest
 from pathlib import Path
-from scripts.csv_merge import merge_csv_files, main
+from scripts.csv_merge import merge_csv_files, merge_csv_files_async, main
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    """Write CSV files into tmp_path as raw bytes, returning their paths."""
+
+    def write(*contents: str, names=None) -> list[Path]:
+        names = names or [f"file{i}.csv" for i in range(1, len(contents) + 1)]
+        paths = []
+        for name, content in zip(names, contents):
+            path = tmp_path / name
+            path.write_bytes(content.encode("utf-8"))
+            paths.append(path)
+        return paths
+
+    return write
 
 
 class TestCSVMerge:
-    def test_merge_by_rows_basic(self, tmp_path):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_merge_by_rows_basic(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv(
+            "name,age\nAlice,30\nBob,25\n", "name,age\nCharlie,35\nDavid,28\n"
+        )
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name,age\nAlice,30\nBob,25\n")
-        csv2.write_text("name,age\nCharlie,35\nDavid,28\n")
-
         stats = merge_csv_files([csv1, csv2], output, merge_mode="rows")
 
         assert stats["files_processed"] == 2
         assert stats["rows_total"] == 4
         assert stats["rows_written"] == 4
 
-        content = output.read_text()
-        assert "Alice,30" in content
-        assert "Bob,25" in content
-        assert "Charlie,35" in content
-        assert "David,28" in content
+        content = output.read_bytes()
+        assert b"Alice,30" in content
+        assert b"Bob,25" in content
+        assert b"Charlie,35" in content
+        assert b"David,28" in content
 
-    def test_merge_by_rows_with_source(self, tmp_path):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_merge_by_rows_with_source(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv("name,age\nAlice,30\n", "name,age\nBob,25\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name,age\nAlice,30\n")
-        csv2.write_text("name,age\nBob,25\n")
-
         stats = merge_csv_files(
             [csv1, csv2], output, merge_mode="rows", add_source=True
         )
 
-        content = output.read_text()
-        assert "_source_file" in content
-        assert "file1.csv" in content
-        assert "file2.csv" in content
+        content = output.read_bytes()
+        assert b"_source_file" in content
+        assert b"file1.csv" in content
+        assert b"file2.csv" in content
 
-    def test_merge_by_rows_deduplicate(self, tmp_path):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_merge_by_rows_deduplicate(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv("name,age\nAlice,30\n", "name,age\nAlice,30\nBob,25\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name,age\nAlice,30\n")
-        csv2.write_text("name,age\nAlice,30\nBob,25\n")
-
         stats = merge_csv_files(
             [csv1, csv2], output, merge_mode="rows", deduplicate=True
         )
@@ -57,33 +63,57 @@ class TestCSVMerge:
         assert stats["rows_written"] == 2
         assert stats["duplicates_removed"] == 1
 
-    def test_merge_by_columns_basic(self, tmp_path):
-        csv1 = tmp_path / "users.csv"
-        csv2 = tmp_path / "details.csv"
+    def test_merge_by_rows_deduplicate_separator_in_fields(self, tmp_path, write_csv):
+        (csv1,) = write_csv("x,y\na\x1fb,c\na,b\x1fc\na,b\x1fc\n")
+        output = tmp_path / "output.csv"
+
+        stats = merge_csv_files([csv1], output, merge_mode="rows", deduplicate=True)
+
+        assert stats["rows_written"] == 2
+        assert stats["duplicates_removed"] == 1
+
+    def test_merge_by_rows_into_an_input(self, tmp_path, write_csv):
+        all_csv, new_csv = write_csv(
+            "name,age\nAlice,30\n", "name,age\nBob,25\n", names=["all.csv", "new.csv"]
+        )
+
+        stats = merge_csv_files([all_csv, new_csv], all_csv, merge_mode="rows")
+
+        assert stats["rows_written"] == 2
+        assert all_csv.read_text().splitlines() == ["name,age", "Alice,30", "Bob,25"]
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["all.csv", "new.csv"]
+
+    def test_merge_by_rows_reorders_columns(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv("name,age\nAlice,30\n", "age,name\n25,Bob\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("id,name\n1,Alice\n2,Bob\n")
-        csv2.write_text("age,city\n30,NYC\n25,LA\n")
+        merge_csv_files([csv1, csv2], output, merge_mode="rows")
+
+        assert output.read_text().splitlines() == ["name,age", "Alice,30", "Bob,25"]
+
+    def test_merge_by_columns_basic(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv(
+            "id,name\n1,Alice\n2,Bob\n",
+            "age,city\n30,NYC\n25,LA\n",
+            names=["users.csv", "details.csv"],
+        )
+        output = tmp_path / "output.csv"
 
         stats = merge_csv_files([csv1, csv2], output, merge_mode="columns")
 
         assert stats["files_processed"] == 2
         assert stats["rows_written"] == 2
 
-        content = output.read_text()
-        assert "users.id" in content or "id" in content
-        assert "users.name" in content or "name" in content
-        assert "details.age" in content or "age" in content
-        assert "details.city" in content or "city" in content
+        content = output.read_bytes()
+        assert b"users.id" in content or b"id" in content
+        assert b"users.name" in content or b"name" in content
+        assert b"details.age" in content or b"age" in content
+        assert b"details.city" in content or b"city" in content
 
-    def test_merge_by_columns_row_count_mismatch(self, tmp_path):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_merge_by_columns_row_count_mismatch(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv("id\n1\n2\n", "value\na\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("id\n1\n2\n")
-        csv2.write_text("value\na\n")
-
         with pytest.raises(ValueError, match="Row count mismatch"):
             merge_csv_files([csv1, csv2], output, merge_mode="columns")
 
@@ -110,55 +140,73 @@ class TestCSVMerge:
 
         assert stats["files_processed"] == 1
 
+    def test_merge_async_runs_concurrently(self, tmp_path, write_csv, monkeypatch):
+        import asyncio
+        import threading
+        from scripts import csv_merge
+
+        csv1, csv2 = write_csv("name\nAlice\n", "name\nBob\n")
+
+        # Each merge waits for the other to start; run one after the other,
+        # the first would time out and break the barrier.
+        barrier = threading.Barrier(2, timeout=5)
+        merge = csv_merge.merge_csv_files
+
+        def merge_when_both_started(*args):
+            barrier.wait()
+            return merge(*args)
+
+        monkeypatch.setattr(csv_merge, "merge_csv_files", merge_when_both_started)
+
+        async def run():
+            return await asyncio.gather(
+                merge_csv_files_async([csv1, csv2], tmp_path / "out1.csv"),
+                merge_csv_files_async([csv2], tmp_path / "out2.csv"),
+            )
+
+        stats1, stats2 = asyncio.run(run())
+
+        assert stats1["rows_written"] == 2
+        assert stats2["rows_written"] == 1
+        assert (tmp_path / "out1.csv").read_text().splitlines() == [
+            "name",
+            "Alice",
+            "Bob",
+        ]
+
 
 class TestCSVMergeCLI:
-    def test_cli_merge_rows(self, tmp_path, capsys):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_cli_merge_rows(self, tmp_path, write_csv, capsys):
+        csv1, csv2 = write_csv("name,age\nAlice,30\n", "name,age\nBob,25\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name,age\nAlice,30\n")
-        csv2.write_text("name,age\nBob,25\n")
-
         result = main([str(csv1), str(csv2), "-o", str(output)])
 
         assert result == 0
         assert output.exists()
 
-    def test_cli_merge_columns(self, tmp_path, capsys):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_cli_merge_columns(self, tmp_path, write_csv, capsys):
+        csv1, csv2 = write_csv("id\n1\n", "value\na\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("id\n1\n")
-        csv2.write_text("value\na\n")
-
         result = main([str(csv1), str(csv2), "-o", str(output), "-m", "columns"])
 
         assert result == 0
 
-    def test_cli_with_source(self, tmp_path):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_cli_with_source(self, tmp_path, write_csv):
+        csv1, csv2 = write_csv("name\nAlice\n", "name\nBob\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name\nAlice\n")
-        csv2.write_text("name\nBob\n")
-
         result = main([str(csv1), str(csv2), "-o", str(output), "--source"])
 
         assert result == 0
-        content = output.read_text()
-        assert "_source_file" in content
+        content = output.read_bytes()
+        assert b"_source_file" in content
 
-    def test_cli_dry_run(self, tmp_path, capsys):
-        csv1 = tmp_path / "file1.csv"
-        csv2 = tmp_path / "file2.csv"
+    def test_cli_dry_run(self, tmp_path, write_csv, capsys):
+        csv1, csv2 = write_csv("name\nAlice\n", "name\nBob\n")
         output = tmp_path / "output.csv"
 
-        csv1.write_text("name\nAlice\n")
-        csv2.write_text("name\nBob\n")
-
         result = main([str(csv1), str(csv2), "-o", str(output), "--dry-run"])
         captured = capsys.readouterr()
 
@@ -4,11 +4,13 @@ import json
 from scripts.data_validator import (
     validate_csv,
     validate_json,
+    validate_json_async,
     parse_rules,
     ValidationRule,
     ValidationResult,
     validate_email,
     validate_url,
+    TYPE_VALIDATORS,
 )
 
 
@@ -30,6 +32,16 @@ class TestValidators:
         assert validate_url("not-a-url") is False
         assert validate_url("ftp://example.com") is False
 
+    def test_numeric_type_validators(self):
+        is_int = TYPE_VALIDATORS["int"]
+        is_float = TYPE_VALIDATORS["float"]
+        assert is_int("42") and is_int("-7") and is_int(3)
+        assert not is_int("4.2") and not is_int("12\n")
+        assert is_float("-1.5") and is_float("2e10") and is_float("6.02E-23")
+        assert is_float(".5") and is_float("5.") and is_float("-.5e3")
+        assert not is_float("1.2.3") and not is_float("abc")
+        assert not is_float(".") and not is_float("-")
+
 
 class TestParseRules:
     def test_parse_simple_rule(self):
@@ -97,6 +109,16 @@ class TestValidateCSV:
         assert result.valid is False
         assert result.invalid_rows == 1
 
+    def test_validate_csv_repeated_invalid_values(self, tmp_path):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("code\nXYZ\nABC123\nXYZ\n")
+
+        rules = [ValidationRule(field="code", pattern=r"^[A-Z]{3}\d{3}$")]
+        result = validate_csv(csv_file, rules)
+
+        assert result.invalid_rows == 2
+        assert [e["row"] for e in result.errors] == [1, 3]
+
     def test_validate_csv_email_validation(self, tmp_path):
         csv_file = tmp_path / "test.csv"
         csv_file.write_text("email\ntest@example.com\ninvalid\n")
@@ -137,6 +159,33 @@ class TestValidateCSV:
         assert result.valid is False
         assert len(result.duplicates) == 1
 
+    def test_validate_csv_short_rows_and_blank_lines(self, tmp_path):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("name,age\nAlice,30\n\nBob\n")
+
+        rules = [
+            ValidationRule(field="age", required=True),
+            ValidationRule(field="missing", type_="int"),
+        ]
+        result = validate_csv(csv_file, rules)
+
+        assert result.total_rows == 2
+        assert result.errors == [{"row": 2, "errors": ["Field 'age' is required"]}]
+
+    def test_validate_csv_fail_fast(self, tmp_path):
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text("age\nabc\n")
+
+        rules = [
+            ValidationRule(field="age", type_="int"),
+            ValidationRule(field="age", pattern=r"^\d+$"),
+        ]
+
+        assert len(validate_csv(csv_file, rules).errors[0]["errors"]) == 2
+        result = validate_csv(csv_file, rules, fail_fast=True)
+        assert result.invalid_rows == 1
+        assert result.errors[0]["errors"] == ["Field 'age' must be a valid int"]
+
 
 class TestValidateJSON:
     def test_validate_json_all_valid(self, tmp_path):
@@ -150,6 +199,18 @@ class TestValidateJSON:
         assert result.valid is True
         assert result.total_rows == 2
 
+    def test_validate_json_async(self, tmp_path):
+        import asyncio
+
+        json_file = tmp_path / "test.json"
+        json_file.write_text(json.dumps([{"name": "Alice"}, {"name": ""}]))
+
+        rules = [ValidationRule(field="name", required=True)]
+        result = asyncio.run(validate_json_async(json_file, rules))
+
+        assert result.total_rows == 2
+        assert result.invalid_rows == 1
+
     def test_validate_json_not_array(self, tmp_path):
         json_file = tmp_path / "test.json"
         json_file.write_text('{"name": "Alice"}')
@@ -81,6 +81,14 @@ class TestEnvTemplate:
 
         assert "API_KEY=secret123" in template
 
+    def test_generate_template_crlf_line_endings(self, tmp_path):
+        env_file = tmp_path / ".env"
+        env_file.write_bytes(b"# comment\r\nAPI_KEY=secret123\r\n\r\nPORT=8080\r\n")
+
+        template = generate_template(env_file)
+
+        assert template == "# comment\nAPI_KEY=YOUR_VALUE_HERE\n\nPORT=8080\n"
+
     def test_generate_template_file_not_found(self, tmp_path):
         env_file = tmp_path / "nonexistent.env"
 
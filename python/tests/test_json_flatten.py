@@ -50,6 +50,25 @@ class TestJSONFlatten:
         result = flatten(data, max_depth=1)
         assert result == {"a.b": {"c": {"d": "value"}}}
 
+    def test_flatten_array_under_empty_key(self):
+        data = {"": [1, {"a": 2}], "a": 3}
+        assert flatten(data) == {".0": 1, ".1.a": 2, "a": 3}
+        assert flatten(data, max_depth=1) == {".0": 1, ".1.a": 2, "a": 3}
+
+    def test_flatten_beyond_recursion_limit(self):
+        import sys
+
+        depth = sys.getrecursionlimit() + 100
+        data: dict = {}
+        node = data
+        for _ in range(depth):
+            node["a"] = {}
+            node = node["a"]
+        node["a"] = "value"
+
+        result = flatten(data)
+        assert result == {".".join(["a"] * (depth + 1)): "value"}
+
     def test_unflatten_simple(self):
         data = {"user.name": "John", "user.age": 30}
         result = unflatten(data)
@@ -92,6 +111,38 @@ class TestJSONFlattenFile:
         output_data = json.loads(output_file.read_text())
         assert output_data == {"user.name": "John"}
 
+    def test_process_file_keeps_wide_integers(self, tmp_path):
+        input_file = tmp_path / "input.json"
+        output_file = tmp_path / "output.json"
+
+        input_file.write_text('{"id": {"big": 123456789012345678901234567890}}')
+
+        process_file(input_file, output_file, mode="flatten")
+
+        output_data = json.loads(output_file.read_text())
+        assert output_data == {"id.big": 123456789012345678901234567890}
+
+    def test_process_file_keeps_non_finite_floats(self, tmp_path):
+        input_file = tmp_path / "input.json"
+        output_file = tmp_path / "output.json"
+
+        input_file.write_text('{"a": NaN, "b": {"c": Infinity, "d": 1e16}}')
+
+        process_file(input_file, output_file, mode="flatten")
+
+        expected = {"a": float("nan"), "b.c": float("inf"), "b.d": 1e16}
+        assert output_file.read_text() == json.dumps(expected, indent=2)
+
+    def test_process_file_keeps_small_float_spelling(self, tmp_path):
+        input_file = tmp_path / "input.json"
+        output_file = tmp_path / "output.json"
+
+        input_file.write_text('{"a": {"b": 5e-05}}')
+
+        process_file(input_file, output_file, mode="flatten")
+
+        assert output_file.read_text() == '{\n  "a.b": 5e-05\n}'
+
     def test_process_file_unflatten(self, tmp_path):
         input_file = tmp_path / "input.json"
         output_file = tmp_path / "output.json"
@@ -9,6 +9,40 @@ from scripts.yaml_json import (
 
 
 class TestYAMLJSON:
+    def test_uses_libyaml_when_available(self):
+        import yaml
+        from scripts import yaml_json
+
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML built without libyaml")
+
+        assert yaml_json._YAML_LOADER is yaml.CSafeLoader
+        assert yaml_json._YAML_DUMPER is yaml.CSafeDumper
+
+    def test_no_libyaml_warning_when_available(self):
+        import subprocess
+        import sys
+        import yaml
+
+        if not yaml.__with_libyaml__:
+            pytest.skip("PyYAML built without libyaml")
+
+        # A fresh interpreter, so the import-time check runs again.
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-W",
+                "error::RuntimeWarning",
+                "-c",
+                "import scripts.yaml_json",
+            ],
+            cwd=Path(__file__).resolve().parents[1],
+            capture_output=True,
+            text=True,
+        )
+
+        assert result.returncode == 0, result.stderr
+
     def test_convert_yaml_to_json(self, tmp_path):
         yaml_file = tmp_path / "test.yaml"
         json_file = tmp_path / "test.json"
@@ -34,6 +68,94 @@ nested:
         assert data["items"] == ["a", "b"]
         assert data["nested"]["key"] == "value"
 
+    def test_convert_yaml_to_json_output_format(self, tmp_path):
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text("1: one\nname: Café\nitems: [1, 2.5, null]\n")
+
+        convert_yaml_to_json(yaml_file, json_file)
+
+        import json
+
+        expected = {1: "one", "name": "Café", "items": [1, 2.5, None]}
+        assert json_file.read_text(encoding="utf-8") == json.dumps(
+            expected, ensure_ascii=False, indent=2
+        )
+
+    def test_convert_yaml_to_json_rejects_date_keys(self, tmp_path):
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text("2024-01-01: release\n")
+
+        for indent in (2, 4):
+            with pytest.raises(TypeError, match="keys must be"):
+                convert_yaml_to_json(yaml_file, json_file, indent=indent)
+        assert not json_file.exists()
+
+    def test_convert_multi_document_yaml_to_json(self, tmp_path):
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text("name: first\n---\n- a\n- b\n---\nname: third\n")
+
+        convert_yaml_to_json(yaml_file, json_file)
+
+        import json
+
+        expected = [{"name": "first"}, ["a", "b"], {"name": "third"}]
+        assert json_file.read_text() == json.dumps(expected, indent=2)
+
+    def test_convert_yaml_to_json_non_finite_floats(self, tmp_path):
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text(
+            "a: .nan\nb: .inf\nc: [-.inf, 1.0e+16, 1.5e-7]\n---\n- .nan\n"
+            "---\n- 5.0e-05\n"
+        )
+
+        convert_yaml_to_json(yaml_file, json_file)
+
+        import json
+
+        nan, inf = float("nan"), float("inf")
+        expected = [{"a": nan, "b": inf, "c": [-inf, 1e16, 1.5e-7]}, [nan], [5e-05]]
+        assert json_file.read_text() == json.dumps(expected, indent=2)
+        assert "NaN" in json_file.read_text()
+
+    def test_convert_large_yaml_to_json(self, tmp_path, monkeypatch):
+        from scripts import yaml_json
+
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text("name: Café\nitems: [1, 2]\n", encoding="utf-8")
+        monkeypatch.setattr(yaml_json, "_MMAP_MIN_BYTES", 1)
+
+        convert_yaml_to_json(yaml_file, json_file)
+
+        import json
+
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert data == {"name": "Café", "items": [1, 2]}
+
+    def test_convert_large_json_to_yaml(self, tmp_path, monkeypatch):
+        from scripts import yaml_json
+
+        json_file = tmp_path / "test.json"
+        yaml_file = tmp_path / "test.yaml"
+
+        json_file.write_text('{"name": "Café", "big": 123456789012345678901234567890}')
+        monkeypatch.setattr(yaml_json, "_MMAP_MIN_BYTES", 1)
+
+        convert_json_to_yaml(json_file, yaml_file)
+
+        assert yaml_file.read_text(encoding="utf-8") == (
+            "name: Café\nbig: 123456789012345678901234567890\n"
+        )
+
     def test_convert_json_to_yaml(self, tmp_path):
         json_file = tmp_path / "test.json"
         yaml_file = tmp_path / "test.yaml"
@@ -49,6 +171,126 @@ nested:
         assert "name: John" in yaml_content
         assert "age: 30" in yaml_content
 
+    def test_convert_json_to_yaml_streams_large_arrays(self, tmp_path, monkeypatch):
+        pytest.importorskip("ijson")
+        from scripts import yaml_json
+
+        json_file = tmp_path / "test.json"
+        streamed = tmp_path / "streamed.yaml"
+        loaded = tmp_path / "loaded.yaml"
+
+        json_file.write_text('[{"name": "Café", "n": 1.5}, ["a", []], "x", null]')
+
+        convert_json_to_yaml(json_file, loaded)
+        monkeypatch.setattr(yaml_json, "_STREAM_JSON_MIN_BYTES", 0)
+        convert_json_to_yaml(json_file, streamed)
+
+        assert streamed.read_bytes() == loaded.read_bytes()
+
+    def test_convert_json_to_yaml_streaming_falls_back_on_nan(
+        self, tmp_path, monkeypatch
+    ):
+        pytest.importorskip("ijson")
+        from scripts import yaml_json
+
+        json_file = tmp_path / "test.json"
+        yaml_file = tmp_path / "test.yaml"
+
+        json_file.write_text('[{"a": 1}, {"b": NaN}, Infinity]')
+        monkeypatch.setattr(yaml_json, "_STREAM_JSON_MIN_BYTES", 0)
+
+        convert_json_to_yaml(json_file, yaml_file)
+
+        assert yaml_file.read_text() == "- a: 1\n- b: .nan\n- .inf\n"
+
+    def test_convert_failure_keeps_previous_output(self, tmp_path, monkeypatch):
+        pytest.importorskip("ijson")
+        from scripts import yaml_json
+
+        json_file = tmp_path / "test.json"
+        yaml_file = tmp_path / "test.yaml"
+
+        json_file.write_text('[{"key": "value"}, {"broken": ]')
+        yaml_file.write_text("previous: output\n")
+        monkeypatch.setattr(yaml_json, "_STREAM_JSON_MIN_BYTES", 0)
+
+        with pytest.raises(ValueError):
+            convert_json_to_yaml(json_file, yaml_file)
+
+        assert yaml_file.read_text() == "previous: output\n"
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["test.json", "test.yaml"]
+
+    def test_convert_output_follows_current_umask(self, tmp_path):
+        import os
+
+        yaml_file = tmp_path / "test.yaml"
+        json_file = tmp_path / "test.json"
+        yaml_file.write_text("key: value\n")
+
+        previous = os.umask(0o027)
+        try:
+            convert_yaml_to_json(yaml_file, json_file)
+        finally:
+            os.umask(previous)
+
+        assert json_file.stat().st_mode & 0o777 == 0o640
+
+    def test_convert_keeps_existing_output_mode_and_symlink(self, tmp_path):
+        yaml_file = tmp_path / "test.yaml"
+        secret = tmp_path / "secret.json"
+        link = tmp_path / "link.json"
+        yaml_file.write_text("key: value\n")
+        secret.write_text("{}")
+        secret.chmod(0o600)
+        link.symlink_to(secret.name)
+
+        convert_yaml_to_json(yaml_file, link)
+
+        assert link.is_symlink()
+        assert secret.stat().st_mode & 0o777 == 0o600
+        assert secret.read_text() == '{\n  "key": "value"\n}'
+
+    def test_convert_json_to_yaml_matches_yaml_dump(self, tmp_path):
+        import json
+        import yaml
+
+        plain = {
+            "name": "John",
+            "age": 30,
+            "ratio": 1e20,
+            "active": True,
+            "items": [{"id": 1, "tags": ["a", "b"]}, [], {}, None],
+            "nested": {"key": "some value", "empty": {}},
+        }
+        quoted = {"answer": "yes", "version": "1.0", "note": "a: b", "blank": ""}
+        astral = {"math": "C\U0001d400b", "\U0001d400": "bold"}
+
+        for data in (plain, quoted, astral):
+            json_file = tmp_path / "test.json"
+            yaml_file = tmp_path / "test.yaml"
+            json_file.write_text(json.dumps(data))
+
+            convert_json_to_yaml(json_file, yaml_file)
+
+            expected = yaml.dump(
+                data,
+                Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper),
+                default_flow_style=False,
+                allow_unicode=True,
+                sort_keys=False,
+            )
+            assert yaml_file.read_text() == expected
+
+    def test_convert_json_to_yaml_keeps_wide_integers(self, tmp_path):
+        json_file = tmp_path / "test.json"
+        yaml_file = tmp_path / "test.yaml"
+
+        json_file.write_text('{"big": 123456789012345678901234567890}')
+
+        convert_json_to_yaml(json_file, yaml_file)
+
+        assert yaml_file.read_text() == "big: 123456789012345678901234567890\n"
+
     def test_batch_convert_yaml_to_json(self, tmp_path):
         input_dir = tmp_path / "input"
         output_dir = tmp_path / "output"
@@ -91,6 +333,223 @@ nested:
         assert stats["failed"] == 1
         assert len(stats["errors"]) == 1
 
+    def test_batch_convert_ignores_other_entries(self, tmp_path):
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        (input_dir / "file1.yaml").write_text("key1: value1\n")
+        (input_dir / "notes.txt").write_text("not yaml\n")
+        (input_dir / "nested.yaml").mkdir()
+
+        stats = batch_convert(input_dir, output_dir, "yaml", "json")
+
+        assert stats["processed"] == 1
+        assert stats["failed"] == 0
+        assert sorted(p.name for p in output_dir.iterdir()) == ["file1.json"]
+
+    def test_batch_convert_parallel(self, tmp_path):
+        import json
+
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        for i in range(9):
+            (input_dir / f"file{i}.yaml").write_text(f"key: value{i}\n")
+        (input_dir / "invalid.yaml").write_text("{invalid yaml: [}")
+
+        stats = batch_convert(input_dir, output_dir, "yaml", "json", workers=2)
+
+        assert stats["processed"] == 9
+        assert stats["failed"] == 1
+        assert "invalid.yaml" in stats["errors"][0]
+        for i in range(9):
+            data = json.loads((output_dir / f"file{i}.json").read_text())
+            assert data == {"key": f"value{i}"}
+
+    def test_batch_convert_workers_from_env(self, tmp_path, monkeypatch):
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        for i in range(4):
+            (input_dir / f"file{i}.yaml").write_text(f"key: value{i}\n")
+
+        monkeypatch.setenv("YAML_JSON_WORKERS", "1")
+        stats = batch_convert(input_dir, output_dir, "yaml", "json")
+
+        assert stats["processed"] == 4
+        assert len(list(output_dir.glob("*.json"))) == 4
+
+    def test_batch_convert_same_format_copies(self, tmp_path):
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        (input_dir / "file1.yaml").write_text("# keep me\nkey: value\n")
+
+        stats = batch_convert(input_dir, output_dir, "yaml", "yaml")
+
+        assert stats["processed"] == 1
+        assert (output_dir / "file1.yaml").read_text() == "# keep me\nkey: value\n"
+
+    def test_batch_convert_same_format_in_place(self, tmp_path):
+        (tmp_path / "file1.json").write_text('{"key": "value"}')
+        (tmp_path / "file2.yaml").write_text("# keep me\nkey: value\n")
+
+        json_stats = batch_convert(tmp_path, tmp_path, "json", "json", indent=4)
+        yaml_stats = batch_convert(tmp_path, tmp_path, "yaml", "yaml")
+
+        assert json_stats["processed"] == yaml_stats["processed"] == 1
+        assert json_stats["failed"] == yaml_stats["failed"] == 0
+        assert (tmp_path / "file1.json").read_text() == '{\n    "key": "value"\n}'
+        assert (tmp_path / "file2.yaml").read_text() == "# keep me\nkey: value\n"
+
+    def test_batch_convert_failed_copy_keeps_previous_output(
+        self, tmp_path, monkeypatch
+    ):
+        from scripts import yaml_json
+
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+        output_dir.mkdir()
+        (input_dir / "file1.yaml").write_text("key: new\n")
+        (output_dir / "file1.yaml").write_text("key: old\n")
+
+        def broken_copy(src, dst, length=0):
+            dst.write(b"key: ne")
+            raise OSError("disk full")
+
+        monkeypatch.setattr(yaml_json.shutil, "copyfileobj", broken_copy)
+
+        stats = batch_convert(input_dir, output_dir, "yaml", "yaml")
+
+        assert stats["failed"] == 1
+        assert (output_dir / "file1.yaml").read_text() == "key: old\n"
+        assert [p.name for p in output_dir.iterdir()] == ["file1.yaml"]
+
+    def test_batch_convert_skip_unchanged(self, tmp_path):
+        import os
+
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        (input_dir / "old.yaml").write_text("key: old\n")
+        (input_dir / "new.yaml").write_text("key: new\n")
+        batch_convert(input_dir, output_dir, "yaml", "json")
+
+        (input_dir / "new.yaml").write_text("key: newer\n")
+        stat = (output_dir / "new.json").stat()
+        os.utime(input_dir / "new.yaml", (stat.st_atime, stat.st_mtime + 10))
+
+        stats = batch_convert(
+            input_dir, output_dir, "yaml", "json", skip_unchanged=True
+        )
+
+        assert stats["processed"] == 1
+        assert stats["skipped"] == 1
+        assert "newer" in (output_dir / "new.json").read_text()
+
+    def test_batch_convert_header_filter(self, tmp_path):
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        body = "".join(f"key{i}: value{i}\n" for i in range(30))
+        (input_dir / "wanted.yaml").write_text("__pipeline__:\n  version: X\n" + body)
+        (input_dir / "other.yaml").write_text("__pipeline__:\n  version: Y\n" + body)
+        (input_dir / "plain.yaml").write_text(body)
+
+        stats = batch_convert(
+            input_dir,
+            output_dir,
+            "yaml",
+            "json",
+            header_filter=lambda d: d.get("__pipeline__", {}).get("version") == "X",
+            header_lines=3,
+        )
+
+        assert stats["processed"] == 1
+        assert stats["skipped"] == 2
+        assert sorted(p.name for p in output_dir.iterdir()) == ["wanted.json"]
+
+    def test_batch_convert_header_filter_json_source(self, tmp_path):
+        import json
+
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        input_dir.mkdir()
+
+        for version in ("X", "Y"):
+            data = {"version": version, "items": list(range(20))}
+            (input_dir / f"{version}.json").write_text(json.dumps(data, indent=2))
+
+        stats = batch_convert(
+            input_dir,
+            output_dir,
+            "json",
+            "yaml",
+            header_filter=lambda d: d.get("version") == "X",
+            header_lines=5,
+        )
+
+        assert stats["processed"] == 1
+        assert stats["skipped"] == 1
+        assert (output_dir / "X.yaml").exists()
+
+    def test_batch_convert_cache(self, tmp_path):
+        import os
+
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        cache_path = tmp_path / "cache.json"
+        input_dir.mkdir()
+
+        (input_dir / "cached.yaml").write_text("key: value\n")
+        (input_dir / "changed.yaml").write_text("key: value\n")
+        stats = batch_convert(
+            input_dir, output_dir, "yaml", "json", cache_path=cache_path
+        )
+        assert stats["processed"] == 2
+
+        # Same size and mtime: the cache must answer without parsing.
+        cached = input_dir / "cached.yaml"
+        stat = cached.stat()
+        cached.write_text("{invalid: [")
+        os.utime(cached, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        (input_dir / "changed.yaml").write_text("key: changed\n")
+
+        stats = batch_convert(
+            input_dir, output_dir, "yaml", "json", cache_path=cache_path
+        )
+
+        assert stats["processed"] == 2
+        assert stats["failed"] == 0
+        assert "changed" in (output_dir / "changed.json").read_text()
+
+    def test_batch_convert_cache_tracks_settings(self, tmp_path):
+        input_dir = tmp_path / "input"
+        output_dir = tmp_path / "output"
+        cache_path = tmp_path / "cache.json"
+        input_dir.mkdir()
+
+        (input_dir / "file.yaml").write_text("key: value\n")
+        batch_convert(input_dir, output_dir, "yaml", "json", cache_path=cache_path)
+
+        stats = batch_convert(
+            input_dir, output_dir, "yaml", "json", indent=4, cache_path=cache_path
+        )
+
+        assert stats["processed"] == 1
+        assert (output_dir / "file.json").read_text() == '{\n    "key": "value"\n}'
+
+    def test_batch_convert_invalid_workers(self, tmp_path):
+        with pytest.raises(ValueError, match="workers must be at least 1"):
+            batch_convert(tmp_path, tmp_path / "output", "yaml", "json", workers=0)
+
 
 class TestYAMLJSONCLI:
     def test_cli_convert_yaml_to_json(self, tmp_path, capsys):
@@ -104,6 +563,17 @@ class TestYAMLJSONCLI:
         assert result == 0
         assert json_file.exists()
 
+    def test_cli_convert_with_indent(self, tmp_path, capsys):
+        yaml_file = tmp_path / "test.YML"
+        json_file = tmp_path / "test.json"
+
+        yaml_file.write_text("key: value\n")
+
+        result = main(["convert", str(yaml_file), str(json_file), "--indent", "4"])
+
+        assert result == 0
+        assert json_file.read_text() == '{\n    "key": "value"\n}'
+
     def test_cli_convert_json_to_yaml(self, tmp_path, capsys):
         import json
 
@@ -153,3 +623,45 @@ class TestYAMLJSONCLI:
         result = main([])
 
         assert result == 1
+
+    def test_cli_fast_parse_matches_argparse(self):
+        from scripts.yaml_json import _get_parser, _parse_fast
+
+        argvs = [
+            ["convert", "a.yaml", "b.json"],
+            ["convert", "a.yaml", "b.json", "--indent", "4"],
+            ["batch", "in", "out", "--from", "yaml", "--to=json"],
+            ["batch", "--workers", "2", "in", "out", "--to", "yaml", "--from", "json"],
+            [
+                "batch",
+                "in",
+                "out",
+                "--from",
+                "json",
+                "--to",
+                "yaml",
+                "--skip-unchanged",
+            ],
+        ]
+        for argv in argvs:
+            assert vars(_parse_fast(argv)) == vars(_get_parser().parse_args(argv))
+
+    def test_cli_fast_parse_defers_to_argparse(self, capsys):
+        from scripts.yaml_json import _parse_fast
+
+        for argv in (
+            [],
+            ["convert", "--help"],
+            ["convert", "a.yaml"],
+            ["convert", "a.yaml", "b.json", "--indent", "x"],
+            ["convert", "a.yaml", "b.json", "--ind", "4"],
+            ["batch", "in", "out", "--from", "xml", "--to", "json"],
+            ["batch", "in", "out", "--from", "yaml"],
+            ["batch", "in", "out", "--from", "yaml", "--to", "json", "--workers"],
+        ):
+            assert _parse_fast(argv) is None
+
+        with pytest.raises(SystemExit) as exc:
+            main(["batch", "in", "out", "--from", "xml", "--to", "json"])
+        assert exc.value.code == 2
+        assert "invalid choice" in capsys.readouterr().err